@@ -19,6 +19,7 @@
 # Author: Mike Schuchardt <mikes@lunarg.com>
 
 import argparse
+import concurrent.futures
 import filecmp
 import os
 import shutil
@@ -81,13 +82,41 @@ def main(argv):
         # generate directly in the repo
         gen_dir = repo_dir
 
-    # run each code generator
-    for cmd in gen_cmds:
-        print(' '.join(cmd))
+    # run the lvl_genvk.py generators concurrently -- each writes its own file, so they are independent. The
+    # remaining commands run afterwards, one at a time, since vk_validation_stats.py parses generated layer sources.
+    genvk_script = common_codegen.repo_relative('scripts/lvl_genvk.py')
+    genvk_cmds = [cmd for cmd in gen_cmds if cmd[0] == genvk_script]
+    post_cmds = [cmd for cmd in gen_cmds if cmd[0] != genvk_script]
+    failed = False
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(genvk_cmds), os.cpu_count() or 1)) as executor:
+        gen_jobs = []
+        for cmd in genvk_cmds:
+            # flush so the echoed command is not buffered behind output the generators write directly
+            print(' '.join(cmd), flush=True)
+            gen_jobs.append(executor.submit(subprocess.check_call, [sys.executable] + cmd, cwd=gen_dir))
+        for cmd, job in zip(genvk_cmds, gen_jobs):
+            try:
+                job.result()
+            except concurrent.futures.CancelledError:
+                pass
+            except Exception as e:
+                print('ERROR: generator failed:', ' '.join(cmd), flush=True)
+                print('ERROR:', str(e), flush=True)
+                if not failed:
+                    # stop generators which have not started yet
+                    for pending_job in gen_jobs:
+                        pending_job.cancel()
+                failed = True
+    if failed:
+        return 1
+
+    for cmd in post_cmds:
+        print(' '.join(cmd), flush=True)
         try:
             subprocess.check_call([sys.executable] + cmd, cwd=gen_dir)
         except Exception as e:
-            print('ERROR:', str(e))
+            print('ERROR: generator failed:', ' '.join(cmd), flush=True)
+            print('ERROR:', str(e), flush=True)
             return 1
 
     # optional post-generation steps
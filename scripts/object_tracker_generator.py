@@ -120,19 +120,124 @@ class ObjectTrackerGeneratorOptions(GeneratorOptions):
 # genType()
 class ObjectTrackerOutputGenerator(OutputGenerator):
     """Generate ObjectTracker code based on XML element attributes"""
-    # This is an ordered list of sections in the header file.
-    ALL_SECTIONS = ['command']
+    # otwrite destinations emitted into each generated file
+    OUTPUT_DESTS = {
+        'object_tracker.h': frozenset(['hdr', 'both']),
+        'object_tracker.cpp': frozenset(['cpp', 'both']),
+        }
+    # VUID argument used when no VUID applies
+    VUID_UNDEFINED = 'kVUIDUndefined'
+    # Trailing parameter added to PostCallRecord prototypes of commands returning VkResult
+    RESULT_PARAM = ',\n    VkResult                                    result)'
+    # Indentation strings for each nesting depth of generated code
+    INDENTS = tuple(['    ' * depth for depth in range(16)])
+    # Loop counter names for each level of nested arrays
+    INDEX_NAMES = tuple(['index%d' % array_index for array_index in range(16)])
+    # Scaffolding wrapped around the validation code for struct members, formatted once per struct visited
+    STRUCT_ARRAY_BEGIN = '{indent}if ({prefix}{name}) {{\n{indent}    for (uint32_t {index} = 0; {index} < {prefix}{count}; ++{index}) {{\n'
+    STRUCT_ARRAY_END = '{indent}    }}\n{indent}}}\n'
+    STRUCT_POINTER_BEGIN = '{indent}if ({prefix}{name}) {{\n'
+    STRUCT_POINTER_END = '{indent}}}\n'
+    # Stands in for the access prefix of a nested struct in its memoized validation code
+    PREFIX_PLACEHOLDER = '@prefix@'
+    # ValidateObject calls emitted by outputObjects for a single handle or a counted array of handles
+    VALIDATE_OBJECT = '{indent}skip |= ValidateObject({disp_name}, {prefix}{name}, {obj_type}, {null_allowed}, {param_vuid}, {parent_vuid});\n'
+    VALIDATE_OBJECT_ARRAY = ('{indent}if ({prefix}{name}) {{\n'
+                             '{indent}    for (uint32_t {index} = 0; {index} < {count}; ++{index}) {{\n'
+                             '{indent}        skip |= ValidateObject({disp_name}, {prefix}{name}[{index}], {obj_type}, {null_allowed}, {param_vuid}, {parent_vuid});\n'
+                             '{indent}    }}\n'
+                             '{indent}}}\n')
+    # Command kinds, assigned once per command by classify_command
+    CMD_OTHER = 'other'
+    CMD_CREATE = 'create'
+    CMD_CREATE_PIPELINES = 'create_pipelines'
+    CMD_DESTROY = 'destroy'
+    CREATE_KINDS = frozenset([CMD_CREATE, CMD_CREATE_PIPELINES])
+    # Patterns matching the command names of each kind, in the order they are checked
+    CMD_KIND_NAME_PATTERNS = (
+        (CMD_CREATE_PIPELINES, re.compile('Create(Graphics|Compute|RayTracing)Pipelines')),
+        (CMD_CREATE, re.compile('Create|Allocate|Enumerate|Register(Device|Display)Event')),
+        (CMD_DESTROY, re.compile('Destroy|Free')),
+        )
+    # CreateObject calls emitted by the create_emitters for a single handle or an array of handles
+    CREATE_OBJECT = '{indent}CreateObject({disp_name}, *{name}, {obj_type}, {allocator});\n'
+    CREATE_OBJECT_ARRAY = ('{indent}if ({name}) {{\n'
+                           '{indent}    for (uint32_t index = 0; index < {count}; index++) {{\n'
+                           '{null_guard}'
+                           '{indent}        CreateObject({disp_name}, {name}[index], {obj_type}, {allocator});\n'
+                           '{indent}    }}\n'
+                           '{indent}}}\n')
+    # The create pipelines APIs may fail after creating some of the pipelines, leaving the rest null
+    CREATE_PIPELINES_RESULT_CHECK = '{indent}if (VK_ERROR_VALIDATION_FAILED_EXT == result) return;\n'
+    # Guards skipping null handles in CREATE_OBJECT_ARRAY, for the command kinds which may return them
+    CREATE_ARRAY_NULL_GUARDS = {
+        CMD_CREATE_PIPELINES: 'if (!pPipelines[index]) continue;\n',
+        }
+    # ValidateDestroyObject and RecordDestroyObject calls emitted by generate_destroy_object_code
+    VALIDATE_DESTROY_OBJECT = '{indent}skip |= ValidateDestroyObject({disp_name}, {name}, {obj_type}, pAllocator, {compatalloc_vuid}, {nullalloc_vuid});\n'
+    RECORD_DESTROY_OBJECT = '{indent}RecordDestroyObject({disp_name}, {name}, {obj_type});\n'
+    # Undestroyed object report and destruction functions, wrapped around one call per non-dispatchable object type
+    REPORT_FUNC = ('bool ObjectLifetimes::ReportUndestroyedObjects(VkDevice device, const std::string& error_code) {{\n'
+                   '    bool skip = false;\n'
+                   '    skip |= DeviceReportUndestroyedObjects(device, kVulkanObjectTypeCommandBuffer, error_code);\n'
+                   '{report_calls}'
+                   '    return skip;\n'
+                   '}}\n')
+    DESTROY_FUNC = ('void ObjectLifetimes::DestroyUndestroyedObjects(VkDevice device) {{\n'
+                    '    DeviceDestroyUndestroyedObjects(device, kVulkanObjectTypeCommandBuffer);\n'
+                    '{destroy_calls}'
+                    '}}\n')
+    # These VUIDS are not implicit, but are best handled in this layer. Codegen for vkDestroy calls looks up the
+    # destroyed parameter name and allocator check here to get a good VU.  Saves ~40 checks.
+    MANUAL_VUIDS = {
+        ("fence", "compatalloc"): "VUID-vkDestroyFence-fence-01121",
+        ("fence", "nullalloc"): "VUID-vkDestroyFence-fence-01122",
+        ("event", "compatalloc"): "VUID-vkDestroyEvent-event-01146",
+        ("event", "nullalloc"): "VUID-vkDestroyEvent-event-01147",
+        ("buffer", "compatalloc"): "VUID-vkDestroyBuffer-buffer-00923",
+        ("buffer", "nullalloc"): "VUID-vkDestroyBuffer-buffer-00924",
+        ("image", "compatalloc"): "VUID-vkDestroyImage-image-01001",
+        ("image", "nullalloc"): "VUID-vkDestroyImage-image-01002",
+        ("shaderModule", "compatalloc"): "VUID-vkDestroyShaderModule-shaderModule-01092",
+        ("shaderModule", "nullalloc"): "VUID-vkDestroyShaderModule-shaderModule-01093",
+        ("pipeline", "compatalloc"): "VUID-vkDestroyPipeline-pipeline-00766",
+        ("pipeline", "nullalloc"): "VUID-vkDestroyPipeline-pipeline-00767",
+        ("sampler", "compatalloc"): "VUID-vkDestroySampler-sampler-01083",
+        ("sampler", "nullalloc"): "VUID-vkDestroySampler-sampler-01084",
+        ("renderPass", "compatalloc"): "VUID-vkDestroyRenderPass-renderPass-00874",
+        ("renderPass", "nullalloc"): "VUID-vkDestroyRenderPass-renderPass-00875",
+        ("descriptorUpdateTemplate", "compatalloc"): "VUID-vkDestroyDescriptorUpdateTemplate-descriptorSetLayout-00356",
+        ("descriptorUpdateTemplate", "nullalloc"): "VUID-vkDestroyDescriptorUpdateTemplate-descriptorSetLayout-00357",
+        ("imageView", "compatalloc"): "VUID-vkDestroyImageView-imageView-01027",
+        ("imageView", "nullalloc"): "VUID-vkDestroyImageView-imageView-01028",
+        ("pipelineCache", "compatalloc"): "VUID-vkDestroyPipelineCache-pipelineCache-00771",
+        ("pipelineCache", "nullalloc"): "VUID-vkDestroyPipelineCache-pipelineCache-00772",
+        ("pipelineLayout", "compatalloc"): "VUID-vkDestroyPipelineLayout-pipelineLayout-00299",
+        ("pipelineLayout", "nullalloc"): "VUID-vkDestroyPipelineLayout-pipelineLayout-00300",
+        ("descriptorSetLayout", "compatalloc"): "VUID-vkDestroyDescriptorSetLayout-descriptorSetLayout-00284",
+        ("descriptorSetLayout", "nullalloc"): "VUID-vkDestroyDescriptorSetLayout-descriptorSetLayout-00285",
+        ("semaphore", "compatalloc"): "VUID-vkDestroySemaphore-semaphore-01138",
+        ("semaphore", "nullalloc"): "VUID-vkDestroySemaphore-semaphore-01139",
+        ("queryPool", "compatalloc"): "VUID-vkDestroyQueryPool-queryPool-00794",
+        ("queryPool", "nullalloc"): "VUID-vkDestroyQueryPool-queryPool-00795",
+        ("bufferView", "compatalloc"): "VUID-vkDestroyBufferView-bufferView-00937",
+        ("bufferView", "nullalloc"): "VUID-vkDestroyBufferView-bufferView-00938",
+        ("surface", "compatalloc"): "VUID-vkDestroySurfaceKHR-surface-01267",
+        ("surface", "nullalloc"): "VUID-vkDestroySurfaceKHR-surface-01268",
+        ("framebuffer", "compatalloc"): "VUID-vkDestroyFramebuffer-framebuffer-00893",
+        ("framebuffer", "nullalloc"): "VUID-vkDestroyFramebuffer-framebuffer-00894",
+        }
+    # MANUAL_VUIDS quoted for use as C string arguments, as returned by GetAllocVuid
+    QUOTED_MANUAL_VUIDS = dict([(key, '"%s"' % vuid) for key, vuid in MANUAL_VUIDS.items()])
     def __init__(self,
                  errFile = sys.stderr,
                  warnFile = sys.stderr,
                  diagFile = sys.stdout):
         OutputGenerator.__init__(self, errFile, warnFile, diagFile)
-        self.INDENT_SPACES = 4
-        self.prototypes = []
         self.instance_extensions = []
         self.device_extensions = []
         # Commands which are not autogenerated but still intercepted
-        self.no_autogen_list = [
+        self.no_autogen_list = frozenset([
             'vkDestroyInstance',
             'vkCreateInstance',
             'vkEnumeratePhysicalDevices',
@@ -165,68 +270,35 @@ class ObjectTrackerOutputGenerator(OutputGenerator):
             'vkReleasePerformanceConfigurationINTEL',
             'vkQueueSetPerformanceConfigurationINTEL',
             'vkCreateFramebuffer',
-            ]
-        # These VUIDS are not implicit, but are best handled in this layer. Codegen for vkDestroy calls will generate a key
-        # which is translated here into a good VU.  Saves ~40 checks.
-        self.manual_vuids = dict()
-        self.manual_vuids = {
-            "fence-compatalloc": "\"VUID-vkDestroyFence-fence-01121\"",
-            "fence-nullalloc": "\"VUID-vkDestroyFence-fence-01122\"",
-            "event-compatalloc": "\"VUID-vkDestroyEvent-event-01146\"",
-            "event-nullalloc": "\"VUID-vkDestroyEvent-event-01147\"",
-            "buffer-compatalloc": "\"VUID-vkDestroyBuffer-buffer-00923\"",
-            "buffer-nullalloc": "\"VUID-vkDestroyBuffer-buffer-00924\"",
-            "image-compatalloc": "\"VUID-vkDestroyImage-image-01001\"",
-            "image-nullalloc": "\"VUID-vkDestroyImage-image-01002\"",
-            "shaderModule-compatalloc": "\"VUID-vkDestroyShaderModule-shaderModule-01092\"",
-            "shaderModule-nullalloc": "\"VUID-vkDestroyShaderModule-shaderModule-01093\"",
-            "pipeline-compatalloc": "\"VUID-vkDestroyPipeline-pipeline-00766\"",
-            "pipeline-nullalloc": "\"VUID-vkDestroyPipeline-pipeline-00767\"",
-            "sampler-compatalloc": "\"VUID-vkDestroySampler-sampler-01083\"",
-            "sampler-nullalloc": "\"VUID-vkDestroySampler-sampler-01084\"",
-            "renderPass-compatalloc": "\"VUID-vkDestroyRenderPass-renderPass-00874\"",
-            "renderPass-nullalloc": "\"VUID-vkDestroyRenderPass-renderPass-00875\"",
-            "descriptorUpdateTemplate-compatalloc": "\"VUID-vkDestroyDescriptorUpdateTemplate-descriptorSetLayout-00356\"",
-            "descriptorUpdateTemplate-nullalloc": "\"VUID-vkDestroyDescriptorUpdateTemplate-descriptorSetLayout-00357\"",
-            "imageView-compatalloc": "\"VUID-vkDestroyImageView-imageView-01027\"",
-            "imageView-nullalloc": "\"VUID-vkDestroyImageView-imageView-01028\"",
-            "pipelineCache-compatalloc": "\"VUID-vkDestroyPipelineCache-pipelineCache-00771\"",
-            "pipelineCache-nullalloc": "\"VUID-vkDestroyPipelineCache-pipelineCache-00772\"",
-            "pipelineLayout-compatalloc": "\"VUID-vkDestroyPipelineLayout-pipelineLayout-00299\"",
-            "pipelineLayout-nullalloc": "\"VUID-vkDestroyPipelineLayout-pipelineLayout-00300\"",
-            "descriptorSetLayout-compatalloc": "\"VUID-vkDestroyDescriptorSetLayout-descriptorSetLayout-00284\"",
-            "descriptorSetLayout-nullalloc": "\"VUID-vkDestroyDescriptorSetLayout-descriptorSetLayout-00285\"",
-            "semaphore-compatalloc": "\"VUID-vkDestroySemaphore-semaphore-01138\"",
-            "semaphore-nullalloc": "\"VUID-vkDestroySemaphore-semaphore-01139\"",
-            "queryPool-compatalloc": "\"VUID-vkDestroyQueryPool-queryPool-00794\"",
-            "queryPool-nullalloc": "\"VUID-vkDestroyQueryPool-queryPool-00795\"",
-            "bufferView-compatalloc": "\"VUID-vkDestroyBufferView-bufferView-00937\"",
-            "bufferView-nullalloc": "\"VUID-vkDestroyBufferView-bufferView-00938\"",
-            "surface-compatalloc": "\"VUID-vkDestroySurfaceKHR-surface-01267\"",
-            "surface-nullalloc": "\"VUID-vkDestroySurfaceKHR-surface-01268\"",
-            "framebuffer-compatalloc": "\"VUID-vkDestroyFramebuffer-framebuffer-00893\"",
-            "framebuffer-nullalloc": "\"VUID-vkDestroyFramebuffer-framebuffer-00894\"",
-           }
+            ])
 
         # Commands shadowed by interface functions and are not implemented
-        self.interface_functions = [
-            ]
+        self.interface_functions = frozenset([
+            ])
         self.headerVersion = None
-        # Internal state - accumulators for different inner block text
-        self.sections = dict([(section, []) for section in self.ALL_SECTIONS])
+        # Internal state
         self.cmd_list = []             # list of commands processed to maintain ordering
         self.cmd_info_dict = {}        # Per entry-point data for code generation and validation
         self.structMembers = []        # List of StructMemberData records for all Vulkan structs
         self.extension_structs = []    # List of all structs or sister-structs containing handles
                                        # A sister-struct may contain no handles but shares <validextensionstructs> with one that does
         self.structTypes = dict()      # Map of Vulkan struct typename to required VkStructureType
-        self.struct_member_dict = dict()
+        self.struct_member_dict = dict()   # Map of Vulkan struct typename to its list of member records
+        self.struct_object_cache = dict()  # Memoized struct_contains_object results, keyed by struct typename
+        self.structs_with_objects = frozenset()  # Structs which contain an object at some level, filled in by endFile
+        self.struct_validation_cache = dict()  # Memoized struct_validation_code results
         # Named tuples to store struct and command data
         self.StructType = namedtuple('StructType', ['name', 'value'])
-        self.CmdInfoData = namedtuple('CmdInfoData', ['name', 'cmdinfo', 'members', 'extra_protect', 'alias', 'iscreate', 'isdestroy', 'allocator'])
-        self.CommandParam = namedtuple('CommandParam', ['type', 'name', 'isconst', 'isoptional', 'iscount', 'iscreate', 'len', 'extstructs', 'cdecl', 'islocal'])
+        # Generators for the CreateObject code of each kind of create command
+        self.create_emitters = {
+            self.CMD_CREATE: self.generate_create_object_code,
+            self.CMD_CREATE_PIPELINES: self.generate_create_pipelines_code,
+            }
+        self.CmdInfoData = namedtuple('CmdInfoData', ['name', 'cmdinfo', 'members', 'extra_protect', 'alias', 'kind', 'hasresult', 'validates_objects', 'allocator'])
+        self.CommandParam = namedtuple('CommandParam', ['type', 'obj_type', 'name', 'isconst', 'isoptional', 'iscount', 'iscreate', 'len', 'extstructs', 'cdecl', 'islocal'])
         self.StructMemberData = namedtuple('StructMemberData', ['name', 'members'])
         self.object_types = []         # List of all handle types
+        self.non_dispatchable_obj_types = []  # VulkanObjectType names of non-dispatchable handles, filled in once all types are known
         self.valid_vuids = set()       # Set of all valid VUIDs
         self.vuid_dict = dict()        # VUID dictionary (from JSON)
     #
@@ -257,34 +329,24 @@ class ObjectTrackerOutputGenerator(OutputGenerator):
                 isoptional = True;
         return isoptional
     #
-    # Get VUID identifier from implicit VUID tag
-    def GetVuid(self, parent, suffix):
+    # Get VUID identifier from implicit VUID tag, falling back to the VUID of the command the parent aliases
+    def GetVuid(self, parent, suffix, alias):
         vuid_string = 'VUID-%s-%s' % (parent, suffix)
-        vuid = "kVUIDUndefined"
+        vuid = self.VUID_UNDEFINED
         if '->' in vuid_string:
            return vuid
         if vuid_string in self.valid_vuids:
             vuid = "\"%s\"" % vuid_string
         else:
-            alias =  self.cmd_info_dict[parent].alias if parent in self.cmd_info_dict else None
             if alias:
                 alias_string = 'VUID-%s-%s' % (alias, suffix)
                 if alias_string in self.valid_vuids:
                     vuid = "\"%s\"" % alias_string
         return vuid
     #
-    # Increases indent by 4 spaces and tracks it globally
-    def incIndent(self, indent):
-        inc = ' ' * self.INDENT_SPACES
-        if indent:
-            return indent + inc
-        return inc
-    #
-    # Decreases indent by 4 spaces and tracks it globally
-    def decIndent(self, indent):
-        if indent and (len(indent) > self.INDENT_SPACES):
-            return indent[:-self.INDENT_SPACES]
-        return ''
+    # Get VUID identifier for the allocator check (compatalloc or nullalloc) of a destroyed parameter
+    def GetAllocVuid(self, param_name, alloc_type):
+        return self.QUOTED_MANUAL_VUIDS.get((param_name, alloc_type), self.VUID_UNDEFINED)
     #
     # Override makeProtoName to drop the "vk" prefix
     def makeProtoName(self, name, tail):
@@ -297,28 +359,14 @@ class ObjectTrackerOutputGenerator(OutputGenerator):
     #
     # Generate the object tracker undestroyed object validation function
     def GenReportFunc(self):
-        output_func = ''
-        output_func += 'bool ObjectLifetimes::ReportUndestroyedObjects(VkDevice device, const std::string& error_code) {\n'
-        output_func += '    bool skip = false;\n'
-        output_func += '    skip |= DeviceReportUndestroyedObjects(device, kVulkanObjectTypeCommandBuffer, error_code);\n'
-        for handle in self.object_types:
-            if self.handle_types.IsNonDispatchable(handle):
-                output_func += '    skip |= DeviceReportUndestroyedObjects(device, %s, error_code);\n' % (self.GetVulkanObjType(handle))
-        output_func += '    return skip;\n'
-        output_func += '}\n'
-        return output_func
+        report_calls = ''.join(['    skip |= DeviceReportUndestroyedObjects(device, %s, error_code);\n' % obj_type for obj_type in self.non_dispatchable_obj_types])
+        return self.REPORT_FUNC.format(report_calls=report_calls)
 
     #
     # Generate the object tracker undestroyed object destruction function
     def GenDestroyFunc(self):
-        output_func = ''
-        output_func += 'void ObjectLifetimes::DestroyUndestroyedObjects(VkDevice device) {\n'
-        output_func += '    DeviceDestroyUndestroyedObjects(device, kVulkanObjectTypeCommandBuffer);\n'
-        for handle in self.object_types:
-            if self.handle_types.IsNonDispatchable(handle):
-                output_func += '    DeviceDestroyUndestroyedObjects(device, %s);\n' % (self.GetVulkanObjType(handle))
-        output_func += '}\n'
-        return output_func
+        destroy_calls = ''.join(['    DeviceDestroyUndestroyedObjects(device, %s);\n' % obj_type for obj_type in self.non_dispatchable_obj_types])
+        return self.DESTROY_FUNC.format(destroy_calls=destroy_calls)
 
     #
     # Walk the JSON-derived dict and find all "vuid" key values
@@ -337,9 +385,7 @@ class ObjectTrackerOutputGenerator(OutputGenerator):
     #
     # Separate content for validation source and header files
     def otwrite(self, dest, formatstring):
-        if 'object_tracker.h' in self.genOpts.filename and (dest == 'hdr' or dest == 'both'):
-            write(formatstring, file=self.outFile)
-        elif 'object_tracker.cpp' in self.genOpts.filename and (dest == 'cpp' or dest == 'both'):
+        if dest in self.output_dests:
             write(formatstring, file=self.outFile)
 
     #
@@ -349,14 +395,13 @@ class ObjectTrackerOutputGenerator(OutputGenerator):
 
         # Initialize members that require the tree
         self.handle_types = GetHandleTypes(self.registry.tree)
+        self.vulkan_obj_types = dict([(handle, 'kVulkanObjectType%s' % handle[2:]) for handle in self.handle_types])
         self.type_categories = GetTypeCategories(self.registry.tree)
 
-        header_file = (genOpts.filename == 'object_tracker.h')
-        source_file = (genOpts.filename == 'object_tracker.cpp')
-
-        if not header_file and not source_file:
+        if genOpts.filename not in self.OUTPUT_DESTS:
             print("Error: Output Filenames have changed, update generator source.\n")
             sys.exit(1)
+        self.output_dests = self.OUTPUT_DESTS[genOpts.filename]
 
         self.valid_usage_path = genOpts.valid_usage_path
         vu_json_filename = os.path.join(self.valid_usage_path + os.sep, 'validusage.json')
@@ -410,10 +455,10 @@ class ObjectTrackerOutputGenerator(OutputGenerator):
     #
     # Now that the data is all collected and complete, generate and output the object validation routines
     def endFile(self):
-        self.struct_member_dict = dict(self.structMembers)
+        self.structs_with_objects = frozenset([struct for struct in self.struct_member_dict if self.struct_contains_object(struct)])
+        self.non_dispatchable_obj_types = [self.GetVulkanObjType(handle) for handle in self.object_types if self.handle_types.IsNonDispatchable(handle)]
         # Generate the list of APIs that might need to handle wrapped extension structs
         # self.GenerateCommandWrapExtensionList()
-        self.WrapCommands()
         # Build undestroyed objects reporting function
         report_func = self.GenReportFunc()
         self.newline()
@@ -429,10 +474,8 @@ class ObjectTrackerOutputGenerator(OutputGenerator):
             if self.featureExtraProtect is not None:
                 prot = '#ifdef %s' % self.featureExtraProtect
                 self.otwrite('both', '%s' % prot)
-            # Write the object_tracker code to the  file
-            if self.sections['command']:
-                source = ('\n'.join(self.sections['command']))
-                self.otwrite('both', '%s' % source)
+            # Generate the object_tracker code, writing it to the file as each command is processed
+            self.WrapCommands()
             if (self.featureExtraProtect is not None):
                 prot = '\n#endif // %s', self.featureExtraProtect
                 self.otwrite('both', prot)
@@ -490,11 +533,6 @@ class ObjectTrackerOutputGenerator(OutputGenerator):
         if category == 'handle':
             self.object_types.append(name)
     #
-    # Append a definition to the specified section
-    def appendSection(self, section, text):
-        # self.sections[section].append('SECTION: ' + section + '\n')
-        self.sections[section].append(text)
-    #
     # Check if the parameter passed in is a pointer
     def paramIsPointer(self, param):
         ispointer = False
@@ -576,6 +614,7 @@ class ObjectTrackerOutputGenerator(OutputGenerator):
             # Store pointer/array/string info
             extstructs = member.attrib.get('validextensionstructs') if name == 'pNext' else None
             membersInfo.append(self.CommandParam(type=type,
+                                                 obj_type=self.vulkan_obj_types.get(type),
                                                  name=name,
                                                  isconst=True if 'const' in cdecl else False,
                                                  isoptional=self.paramIsOptional(member),
@@ -586,6 +625,7 @@ class ObjectTrackerOutputGenerator(OutputGenerator):
                                                  islocal=False,
                                                  iscreate=False))
         self.structMembers.append(self.StructMemberData(name=typeName, members=membersInfo))
+        self.struct_member_dict[typeName] = membersInfo
     #
     # Insert a lock_guard line
     def lock_guard(self, indent):
@@ -593,17 +633,36 @@ class ObjectTrackerOutputGenerator(OutputGenerator):
     #
     # Determine if a struct has an object as a member or an embedded member
     def struct_contains_object(self, struct_item):
-        struct_member_dict = dict(self.structMembers)
-        struct_members = struct_member_dict[struct_item]
-
-        for member in struct_members:
-            if member.type in self.handle_types:
-                return True
-            # recurse for member structs, guard against infinite recursion
-            elif member.type in struct_member_dict and member.type != struct_item:
-                if self.struct_contains_object(member.type):
-                    return True
-        return False
+        return self.walk_struct_objects(struct_item, set())[0]
+    #
+    # Walk the members of a struct for objects, returning (contains_object, is_final). A struct reached again while
+    # its own members are still being walked (a cycle) counts as False for now, and a False result that relied on that
+    # is not final, so only final results go in the cache.
+    def walk_struct_objects(self, struct_item, in_progress):
+        if struct_item in self.struct_object_cache:
+            return self.struct_object_cache[struct_item], True
+        if struct_item in in_progress:
+            return False, False
+        in_progress.add(struct_item)
+        contains_object = False
+        is_final = True
+        for member in self.struct_member_dict[struct_item]:
+            if member.obj_type is not None:
+                contains_object = True
+                break
+            # recurse for member structs
+            elif member.type in self.struct_member_dict:
+                member_contains_object, member_is_final = self.walk_struct_objects(member.type, in_progress)
+                if member_contains_object:
+                    contains_object = True
+                    break
+                is_final = is_final and member_is_final
+        in_progress.remove(struct_item)
+        # Once the outermost struct is walked, every struct in a cycle through it has been fully explored
+        is_final = contains_object or is_final or not in_progress
+        if is_final:
+            self.struct_object_cache[struct_item] = contains_object
+        return contains_object, is_final
     #
     # Return list of struct members which contain, or whose sub-structures contain an obj in a given list of parameters or members
     def getParmeterStructsWithObjects(self, item_list):
@@ -652,189 +711,187 @@ class ObjectTrackerOutputGenerator(OutputGenerator):
                         return True
         return False
     #
-    # Generate VulkanObjectType from object type
+    # Return the indentation for a nesting depth of generated code, building it for depths beyond the INDENTS table
+    def GetIndent(self, depth):
+        if depth < len(self.INDENTS):
+            return self.INDENTS[depth]
+        return '    ' * depth
+    #
+    # Return the loop counter name for a level of nested arrays, building it for levels beyond the INDEX_NAMES table
+    def GetIndexName(self, array_index):
+        if array_index < len(self.INDEX_NAMES):
+            return self.INDEX_NAMES[array_index]
+        return 'index%d' % array_index
+    #
+    # Look up VulkanObjectType for a handle type
     def GetVulkanObjType(self, type):
-        return 'kVulkanObjectType%s' % type[2:]
+        return self.vulkan_obj_types[type]
     #
     # Return correct dispatch table type -- instance or device
     def GetDispType(self, type):
         return 'instance' if type in ['VkInstance', 'VkPhysicalDevice'] else 'device'
     #
-    # Generate source for creating a Vulkan object
-    def generate_create_object_code(self, indent, proto, params, cmd_info, allocator):
-        create_obj_code = ''
-        handle_type = params[-1].find('type')
-        is_create_pipelines = False
-
-        if handle_type.text in self.handle_types:
+    # Return the template fields shared by the CreateObject code for the handles created by a command
+    def create_object_fields(self, depth, cmddata):
+        cmd_info = cmddata.members
+        created = cmd_info[-1]
+        fields = dict(indent=self.GetIndent(depth), disp_name=cmd_info[0].name, name=created.name,
+                      obj_type=created.obj_type, allocator=cmddata.allocator)
+        if created.len is not None:
+            countispointer = ''
+            if 'uint32_t*' in cmd_info[-2].cdecl:
+                countispointer = '*'
+            fields['count'] = '%s%s' % (countispointer, created.len)
+            null_guard = self.CREATE_ARRAY_NULL_GUARDS.get(cmddata.kind)
+            fields['null_guard'] = self.GetIndent(depth + 2) + null_guard if null_guard is not None else ''
+        return fields
+    #
+    # Generate source for creating a Vulkan object, appending it to the create_obj_code list
+    def generate_create_object_code(self, depth, cmddata, create_obj_code):
+        created = cmddata.members[-1]
+        if created.obj_type is not None:
+            fields = self.create_object_fields(depth, cmddata)
             # Check for special case where multiple handles are returned
-            object_array = False
-            if cmd_info[-1].len is not None:
-                object_array = True;
-            handle_name = params[-1].find('name')
-            object_dest = '*%s' % handle_name.text
-            if object_array == True:
-                if 'CreateGraphicsPipelines' in proto.text or 'CreateComputePipelines' in proto.text or 'CreateRayTracingPipelines' in proto.text:
-                    is_create_pipelines = True
-                    create_obj_code += '%sif (VK_ERROR_VALIDATION_FAILED_EXT == result) return;\n' % indent
-                create_obj_code += '%sif (%s) {\n' % (indent, handle_name.text)
-                indent = self.incIndent(indent)
-                countispointer = ''
-                if 'uint32_t*' in cmd_info[-2].cdecl:
-                    countispointer = '*'
-                create_obj_code += '%sfor (uint32_t index = 0; index < %s%s; index++) {\n' % (indent, countispointer, cmd_info[-1].len)
-                indent = self.incIndent(indent)
-                object_dest = '%s[index]' % cmd_info[-1].name
-
-            dispobj = params[0].find('type').text
-            if is_create_pipelines:
-                create_obj_code += '%sif (!pPipelines[index]) continue;\n' % indent
-            create_obj_code += '%sCreateObject(%s, %s, %s, %s);\n' % (indent, params[0].find('name').text, object_dest, self.GetVulkanObjType(cmd_info[-1].type), allocator)
+            if created.len is not None:
+                create_obj_code.append(self.CREATE_OBJECT_ARRAY.format_map(fields))
+            else:
+                create_obj_code.append(self.CREATE_OBJECT.format_map(fields))
+    #
+    # Generate source for creating the array of pipelines returned by a create pipelines API, which may hold null
+    # pipelines even when the call fails
+    def generate_create_pipelines_code(self, depth, cmddata, create_obj_code):
+        created = cmddata.members[-1]
+        # Anything other than a counted array of handles gets the generic create code
+        if created.obj_type is None or created.len is None:
+            self.generate_create_object_code(depth, cmddata, create_obj_code)
+            return
+        fields = self.create_object_fields(depth, cmddata)
+        create_obj_code.append(self.CREATE_PIPELINES_RESULT_CHECK.format_map(fields))
+        create_obj_code.append(self.CREATE_OBJECT_ARRAY.format_map(fields))
+    #
+    # Generate source for destroying a non-dispatchable object, appending it to the validate_code and record_code lists
+    def generate_destroy_object_code(self, depth, cmd_info, validate_code, record_code):
+        indent = self.GetIndent(depth)
+        # Check for special case where multiple handles are returned
+        object_array = cmd_info[-1].len is not None
+        destroyed = cmd_info[-1] if object_array else cmd_info[-2]
+        if destroyed.obj_type is not None:
             if object_array == True:
-                indent = self.decIndent(indent)
-                create_obj_code += '%s}\n' % indent
-                indent = self.decIndent(indent)
-                create_obj_code += '%s}\n' % indent
-            indent = self.decIndent(indent)
-
-        return create_obj_code
-    #
-    # Generate source for destroying a non-dispatchable object
-    def generate_destroy_object_code(self, indent, proto, cmd_info):
-        validate_code = ''
-        record_code = ''
-        object_array = False
-        if True in [destroy_txt in proto.text for destroy_txt in ['Destroy', 'Free']]:
-            # Check for special case where multiple handles are returned
-            if cmd_info[-1].len is not None:
-                object_array = True;
-                param = -1
+                # This API is freeing an array of handles -- add loop control
+                validate_code.append('HEY, NEED TO DESTROY AN ARRAY\n')
             else:
-                param = -2
-            compatalloc_vuid_string = '%s-compatalloc' % cmd_info[param].name
-            nullalloc_vuid_string = '%s-nullalloc' % cmd_info[param].name
-            compatalloc_vuid = self.manual_vuids.get(compatalloc_vuid_string, "kVUIDUndefined")
-            nullalloc_vuid = self.manual_vuids.get(nullalloc_vuid_string, "kVUIDUndefined")
-            if cmd_info[param].type in self.handle_types:
-                if object_array == True:
-                    # This API is freeing an array of handles -- add loop control
-                    validate_code += 'HEY, NEED TO DESTROY AN ARRAY\n'
-                else:
-                    dispobj = cmd_info[0].type
-                    # Call Destroy a single time
-                    validate_code += '%sskip |= ValidateDestroyObject(%s, %s, %s, pAllocator, %s, %s);\n' % (indent, cmd_info[0].name, cmd_info[param].name, self.GetVulkanObjType(cmd_info[param].type), compatalloc_vuid, nullalloc_vuid)
-                    record_code += '%sRecordDestroyObject(%s, %s, %s);\n' % (indent, cmd_info[0].name, cmd_info[param].name, self.GetVulkanObjType(cmd_info[param].type))
-        return object_array, validate_code, record_code
-    #
-    # Output validation for a single object (obj_count is NULL) or a counted list of objects
-    def outputObjects(self, obj_type, obj_name, obj_count, prefix, index, indent, disp_name, parent_name, null_allowed, top_level):
-        pre_call_code = ''
+                fields = dict(indent=indent, disp_name=cmd_info[0].name, name=destroyed.name, obj_type=destroyed.obj_type,
+                              compatalloc_vuid=self.GetAllocVuid(destroyed.name, 'compatalloc'),
+                              nullalloc_vuid=self.GetAllocVuid(destroyed.name, 'nullalloc'))
+                # Call Destroy a single time
+                validate_code.append(self.VALIDATE_DESTROY_OBJECT.format_map(fields))
+                record_code.append(self.RECORD_DESTROY_OBJECT.format_map(fields))
+    #
+    # Output validation for a single object (obj_count is NULL) or a counted list of objects, given its VulkanObjectType
+    def outputObjects(self, obj_type, obj_name, obj_count, prefix, index, indent, disp_name, parent_name, parent_alias, null_allowed, top_level):
         param_suffix = '%s-parameter' % (obj_name)
         parent_suffix = '%s-parent' % (obj_name)
-        param_vuid = self.GetVuid(parent_name, param_suffix)
-        parent_vuid = self.GetVuid(parent_name, parent_suffix)
+        param_vuid = self.GetVuid(parent_name, param_suffix, parent_alias)
+        parent_vuid = self.GetVuid(parent_name, parent_suffix, parent_alias)
 
         # If no parent VUID for this member, look for a commonparent VUID
-        if parent_vuid == 'kVUIDUndefined':
-            parent_vuid = self.GetVuid(parent_name, 'commonparent')
+        if parent_vuid == self.VUID_UNDEFINED:
+            parent_vuid = self.GetVuid(parent_name, 'commonparent', parent_alias)
+        fields = dict(indent=indent, disp_name=disp_name, prefix=prefix, name=obj_name, index=index, count=obj_count,
+                      obj_type=obj_type, null_allowed=null_allowed, param_vuid=param_vuid, parent_vuid=parent_vuid)
         if obj_count is not None:
-
-            pre_call_code += '%sif (%s%s) {\n' % (indent, prefix, obj_name)
-            indent = self.incIndent(indent)
-            pre_call_code += '%sfor (uint32_t %s = 0; %s < %s; ++%s) {\n' % (indent, index, index, obj_count, index)
-            indent = self.incIndent(indent)
-            pre_call_code += '%sskip |= ValidateObject(%s, %s%s[%s], %s, %s, %s, %s);\n' % (indent, disp_name, prefix, obj_name, index, self.GetVulkanObjType(obj_type), null_allowed, param_vuid, parent_vuid)
-            indent = self.decIndent(indent)
-            pre_call_code += '%s}\n' % indent
-            indent = self.decIndent(indent)
-            pre_call_code += '%s}\n' % indent
-        else:
-            pre_call_code += '%sskip |= ValidateObject(%s, %s%s, %s, %s, %s, %s);\n' % (indent, disp_name, prefix, obj_name, self.GetVulkanObjType(obj_type), null_allowed, param_vuid, parent_vuid)
-        return pre_call_code
+            return self.VALIDATE_OBJECT_ARRAY.format_map(fields)
+        return self.VALIDATE_OBJECT.format_map(fields)
     #
     # first_level_param indicates if elements are passed directly into the function else they're below a ptr/struct
-    def validate_objects(self, members, indent, prefix, array_index, disp_name, parent_name, first_level_param):
-        pre_code = ''
-        index = 'index%s' % str(array_index)
+    # Generated code is passed to the sink callable, a single sink shared by all levels of the recursion
+    def validate_objects(self, members, depth, prefix, array_index, disp_name, parent_name, first_level_param, sink):
+        indent = self.GetIndent(depth)
+        index = self.GetIndexName(array_index)
         array_index += 1
+        # The alias is only needed for VUID lookups, so resolve it once for all members
+        parent_alias = self.cmd_info_dict[parent_name].alias if parent_name in self.cmd_info_dict else None
         # Process any objects in this structure and recurse for any sub-structs in this struct
         for member in members:
+            is_object = member.obj_type is not None
+            # Skip members which neither are nor contain an object before doing any other work
+            if not is_object and member.type not in self.structs_with_objects:
+                continue
             # Handle objects
             if member.iscreate and first_level_param and member == members[-1]:
                 continue
-            if member.type in self.handle_types:
+            if is_object:
                 count_name = member.len
                 if (count_name is not None):
                     count_name = '%s%s' % (prefix, member.len)
                 null_allowed = member.isoptional
-                tmp_pre = self.outputObjects(member.type, member.name, count_name, prefix, index, indent, disp_name, parent_name, str(null_allowed).lower(), first_level_param)
-                pre_code += tmp_pre
+                sink(self.outputObjects(member.obj_type, member.name, count_name, prefix, index, indent, disp_name, parent_name, parent_alias, str(null_allowed).lower(), first_level_param))
             # Handle Structs that contain objects at some level
-            elif member.type in self.struct_member_dict:
-                # Structs at first level will have an object
-                if self.struct_contains_object(member.type) == True:
-                    struct_info = self.struct_member_dict[member.type]
-                    # TODO (jbolz): Can this use paramIsPointer?
-                    ispointer = '*' in member.cdecl;
-                    # Struct Array
-                    if member.len is not None:
-                        # Update struct prefix
-                        new_prefix = '%s%s' % (prefix, member.name)
-                        pre_code += '%sif (%s%s) {\n' % (indent, prefix, member.name)
-                        indent = self.incIndent(indent)
-                        pre_code += '%sfor (uint32_t %s = 0; %s < %s%s; ++%s) {\n' % (indent, index, index, prefix, member.len, index)
-                        indent = self.incIndent(indent)
-                        local_prefix = '%s[%s].' % (new_prefix, index)
-                        # Process sub-structs in this struct
-                        tmp_pre = self.validate_objects(struct_info, indent, local_prefix, array_index, disp_name, member.type, False)
-                        pre_code += tmp_pre
-                        indent = self.decIndent(indent)
-                        pre_code += '%s}\n' % indent
-                        indent = self.decIndent(indent)
-                        pre_code += '%s}\n' % indent
-                    # Single Struct
-                    elif ispointer:
-                        # Update struct prefix
-                        new_prefix = '%s%s->' % (prefix, member.name)
-                        # Declare safe_VarType for struct
-                        pre_code += '%sif (%s%s) {\n' % (indent, prefix, member.name)
-                        indent = self.incIndent(indent)
-                        # Process sub-structs in this struct
-                        tmp_pre = self.validate_objects(struct_info, indent, new_prefix, array_index, disp_name, member.type, False)
-                        pre_code += tmp_pre
-                        indent = self.decIndent(indent)
-                        pre_code += '%s}\n' % indent
-        return pre_code
+            else:
+                # TODO (jbolz): Can this use paramIsPointer?
+                ispointer = '*' in member.cdecl;
+                # Struct Array
+                if member.len is not None:
+                    # Update struct prefix
+                    local_prefix = '%s%s[%s].' % (prefix, member.name, index)
+                    sink(self.STRUCT_ARRAY_BEGIN.format(indent=indent, prefix=prefix, name=member.name, index=index, count=member.len))
+                    # Process sub-structs in this struct
+                    sink(self.struct_validation_code(member.type, depth + 2, array_index, disp_name).replace(self.PREFIX_PLACEHOLDER, local_prefix))
+                    sink(self.STRUCT_ARRAY_END.format(indent=indent))
+                # Single Struct
+                elif ispointer:
+                    # Update struct prefix
+                    new_prefix = '%s%s->' % (prefix, member.name)
+                    sink(self.STRUCT_POINTER_BEGIN.format(indent=indent, prefix=prefix, name=member.name))
+                    # Process sub-structs in this struct
+                    sink(self.struct_validation_code(member.type, depth + 1, array_index, disp_name).replace(self.PREFIX_PLACEHOLDER, new_prefix))
+                    sink(self.STRUCT_POINTER_END.format(indent=indent))
+    #
+    # Return the validation code for the members of a struct nested below a command parameter, with PREFIX_PLACEHOLDER
+    # standing in for the expression which accesses the struct. Many commands share structs, so this is memoized.
+    def struct_validation_code(self, struct_type, depth, array_index, disp_name):
+        key = (struct_type, depth, array_index, disp_name)
+        code = self.struct_validation_cache.get(key)
+        if code is None:
+            pre_code = []
+            self.validate_objects(self.struct_member_dict[struct_type], depth, self.PREFIX_PLACEHOLDER, array_index, disp_name, struct_type, False, pre_code.append)
+            code = ''.join(pre_code)
+            self.struct_validation_cache[key] = code
+        return code
     #
     # For a particular API, generate the object handling code
     def generate_wrapping_code(self, cmd):
-        indent = '    '
-        pre_call_validate = ''
-        pre_call_record = ''
-        post_call_record = ''
-
-        destroy_array = False
-        validate_destroy_code = ''
-        record_destroy_code = ''
+        depth = 1
+        pre_call_validate = []
+        pre_call_record = []
+        post_call_record = []
 
         proto = cmd.find('proto/name')
-        params = cmd.findall('param')
         if proto.text is not None:
             cmddata = self.cmd_info_dict[proto.text]
             cmd_info = cmddata.members
             disp_name = cmd_info[0].name
             # Handle object create operations if last parameter is created by this call
-            if cmddata.iscreate:
-                post_call_record += self.generate_create_object_code(indent, proto, params, cmd_info, cmddata.allocator)
-            # Handle object destroy operations
-            if cmddata.isdestroy:
-                (destroy_array, validate_destroy_code, record_destroy_code) = self.generate_destroy_object_code(indent, proto, cmd_info)
-
-            pre_call_record += record_destroy_code
-            pre_call_validate += self.validate_objects(cmd_info, indent, '', 0, disp_name, proto.text, True)
-            pre_call_validate += validate_destroy_code
+            create_emitter = self.create_emitters.get(cmddata.kind)
+            if create_emitter is not None:
+                create_emitter(depth, cmddata, post_call_record)
+            if cmddata.validates_objects:
+                self.validate_objects(cmd_info, depth, '', 0, disp_name, proto.text, True, pre_call_validate.append)
+            # Handle object destroy operations, validated after all other parameters
+            if cmddata.kind == self.CMD_DESTROY:
+                self.generate_destroy_object_code(depth, cmd_info, pre_call_validate, pre_call_record)
 
-        return pre_call_validate, pre_call_record, post_call_record
+        return ''.join(pre_call_validate), ''.join(pre_call_record), ''.join(post_call_record)
+    #
+    # Return the kind of object handling a command needs, based on its name. The create pipelines APIs are a kind of
+    # their own since they may create objects even when they fail.
+    def classify_command(self, cmdname, last_member_is_pointer):
+        for kind, name_pattern in self.CMD_KIND_NAME_PATTERNS:
+            if name_pattern.search(cmdname):
+                return kind
+        if 'vkGet' in cmdname and last_member_is_pointer:
+            return self.CMD_CREATE
+        return self.CMD_OTHER
     #
     # Capture command parameter info needed to create, destroy, and validate objects
     def genCmd(self, cmdinfo, cmdname, alias):
@@ -848,13 +905,12 @@ class ObjectTrackerOutputGenerator(OutputGenerator):
             length = self.getLen(member)
             if length:
                 lens.add(length)
-        struct_member_dict = dict(self.structMembers)
 
         # Set command invariant information needed at a per member level in validate...
-        is_create_command = any(filter(lambda pat: pat in cmdname, ('Create', 'Allocate', 'Enumerate', 'RegisterDeviceEvent', 'RegisterDisplayEvent')))
         last_member_is_pointer = len(members) and self.paramIsPointer(members[-1])
-        iscreate = is_create_command or ('vkGet' in cmdname and last_member_is_pointer)
-        isdestroy = any([destroy_txt in cmdname for destroy_txt in ['Destroy', 'Free']])
+        kind = self.classify_command(cmdname, last_member_is_pointer)
+        iscreate = kind in self.CREATE_KINDS
+        hasresult = cmdinfo.elem.find('proto/type').text == 'VkResult'
 
         # Generate member info
         membersInfo = []
@@ -876,13 +932,14 @@ class ObjectTrackerOutputGenerator(OutputGenerator):
                 if (length is not None) and (isconst == True):
                     islocal = True
             # Or if it's a struct that contains an object
-            elif type in struct_member_dict:
+            elif type in self.struct_member_dict:
                 if self.struct_contains_object(type) == True:
                     islocal = True
             if type == 'VkAllocationCallbacks':
                 allocator = name
             extstructs = member.attrib.get('validextensionstructs') if name == 'pNext' else None
             membersInfo.append(self.CommandParam(type=type,
+                                                 obj_type=self.vulkan_obj_types.get(type),
                                                  name=name,
                                                  isconst=isconst,
                                                  isoptional=self.paramIsOptional(member),
@@ -892,100 +949,92 @@ class ObjectTrackerOutputGenerator(OutputGenerator):
                                                  cdecl=cdecl,
                                                  islocal=islocal,
                                                  iscreate=iscreate))
+        # Commands with no objects to validate, other than the one they create, can skip validate_objects entirely
+        validated_members = membersInfo[:-1] if iscreate else membersInfo
+        validates_objects = any([member.obj_type is not None or member.islocal for member in validated_members])
 
         self.cmd_list.append(cmdname)
-        self.cmd_info_dict[cmdname] =self.CmdInfoData(name=cmdname, cmdinfo=cmdinfo, members=membersInfo, iscreate=iscreate, isdestroy=isdestroy, allocator=allocator, extra_protect=self.featureExtraProtect, alias=alias)
+        self.cmd_info_dict[cmdname] =self.CmdInfoData(name=cmdname, cmdinfo=cmdinfo, members=membersInfo, kind=kind, hasresult=hasresult, validates_objects=validates_objects, allocator=allocator, extra_protect=self.featureExtraProtect, alias=alias)
     #
     # Create code Create, Destroy, and validate Vulkan objects
     def WrapCommands(self):
+        header_file = 'hdr' in self.output_dests
+        source_file = 'cpp' in self.output_dests
         for cmdname in self.cmd_list:
             cmddata = self.cmd_info_dict[cmdname]
             cmdinfo = cmddata.cmdinfo
             if cmdname in self.interface_functions:
                 continue
-            manual = False
-            if cmdname in self.no_autogen_list:
-                manual = True
+            manual = cmdname in self.no_autogen_list
+            # Lines of output for this command, written to the file at once
+            command_lines = []
 
             # Generate object handling code
             (pre_call_validate, pre_call_record, post_call_record) = self.generate_wrapping_code(cmdinfo.elem)
 
             feature_extra_protect = cmddata.extra_protect
             if (feature_extra_protect is not None):
-                self.appendSection('command', '')
-                self.appendSection('command', '#ifdef '+ feature_extra_protect)
-                self.prototypes += [ '#ifdef %s' % feature_extra_protect ]
-
-            # Add intercept to procmap
-            self.prototypes += [ '    {"%s", (void*)%s},' % (cmdname,cmdname[2:]) ]
+                command_lines.append('')
+                command_lines.append('#ifdef '+ feature_extra_protect)
 
+            # Prototype text following the calling convention, without the trailing semicolon
             decls = self.makeCDecls(cmdinfo.elem)
+            func_decl_template = decls[0][:-1].partition('VKAPI_CALL ')[2]
 
-            # Gather the parameter items
-            params = cmdinfo.elem.findall('param/name')
-            # Pull out the text for each of the parameters, separate them by commas in a list
-            paramstext = ', '.join([str(param.text) for param in params])
-            # Generate the API call template
-            fcn_call = cmdinfo.elem.attrib.get('name').replace('vk', 'TOKEN', 1) + '(' + paramstext + ');'
-
-            func_decl_template = decls[0][:-1].split('VKAPI_CALL ')
-            func_decl_template = func_decl_template[1]
-
-            result_type = cmdinfo.elem.find('proto/type')
-
-            if 'object_tracker.h' in self.genOpts.filename:
+            if header_file:
                 # Output PreCallValidateAPI prototype if necessary
                 if pre_call_validate:
                     pre_cv_func_decl = 'bool PreCallValidate' + func_decl_template + ';'
-                    self.appendSection('command', pre_cv_func_decl)
+                    command_lines.append(pre_cv_func_decl)
 
                 # Output PreCallRecordAPI prototype if necessary
                 if pre_call_record:
                     pre_cr_func_decl = 'void PreCallRecord' + func_decl_template + ';'
-                    self.appendSection('command', pre_cr_func_decl)
+                    command_lines.append(pre_cr_func_decl)
 
                 # Output PosCallRecordAPI prototype if necessary
                 if post_call_record:
                     post_cr_func_decl = 'void PostCallRecord' + func_decl_template + ';'
-                    if result_type.text == 'VkResult':
-                        post_cr_func_decl = post_cr_func_decl.replace(')', ',\n    VkResult                                    result)')
-                    self.appendSection('command', post_cr_func_decl)
+                    if cmddata.hasresult:
+                        post_cr_func_decl = post_cr_func_decl.replace(')', self.RESULT_PARAM)
+                    command_lines.append(post_cr_func_decl)
 
-            if 'object_tracker.cpp' in self.genOpts.filename:
+            if source_file:
                 # Output PreCallValidateAPI function if necessary
                 if pre_call_validate and not manual:
                     pre_cv_func_decl = 'bool ObjectLifetimes::PreCallValidate' + func_decl_template + ' {'
-                    self.appendSection('command', '')
-                    self.appendSection('command', pre_cv_func_decl)
-                    self.appendSection('command', '    bool skip = false;')
-                    self.appendSection('command', pre_call_validate)
-                    self.appendSection('command', '    return skip;')
-                    self.appendSection('command', '}')
+                    command_lines.append('')
+                    command_lines.append(pre_cv_func_decl)
+                    command_lines.append('    bool skip = false;')
+                    command_lines.append(pre_call_validate)
+                    command_lines.append('    return skip;')
+                    command_lines.append('}')
 
                 # Output PreCallRecordAPI function if necessary
                 if pre_call_record and not manual:
                     pre_cr_func_decl = 'void ObjectLifetimes::PreCallRecord' + func_decl_template + ' {'
-                    self.appendSection('command', '')
-                    self.appendSection('command', pre_cr_func_decl)
-                    self.appendSection('command', pre_call_record)
-                    self.appendSection('command', '}')
+                    command_lines.append('')
+                    command_lines.append(pre_cr_func_decl)
+                    command_lines.append(pre_call_record)
+                    command_lines.append('}')
 
                 # Output PosCallRecordAPI function if necessary
                 if post_call_record and not manual:
                     post_cr_func_decl = 'void ObjectLifetimes::PostCallRecord' + func_decl_template + ' {'
-                    self.appendSection('command', '')
+                    command_lines.append('')
 
-                    if result_type.text == 'VkResult':
-                        post_cr_func_decl = post_cr_func_decl.replace(')', ',\n    VkResult                                    result)')
-                        # The two createpipelines APIs may create on failure -- skip the success result check
-                        if 'CreateGraphicsPipelines' not in cmdname and 'CreateComputePipelines' not in cmdname and 'CreateRayTracingPipelines' not in cmdname:
+                    if cmddata.hasresult:
+                        post_cr_func_decl = post_cr_func_decl.replace(')', self.RESULT_PARAM)
+                        # The createpipelines APIs may create on failure -- skip the success result check
+                        if cmddata.kind != self.CMD_CREATE_PIPELINES:
                             post_cr_func_decl = post_cr_func_decl.replace('{', '{\n    if (result != VK_SUCCESS) return;')
-                    self.appendSection('command', post_cr_func_decl)
+                    command_lines.append(post_cr_func_decl)
 
 
-                    self.appendSection('command', post_call_record)
-                    self.appendSection('command', '}')
+                    command_lines.append(post_call_record)
+                    command_lines.append('}')
 
             if (feature_extra_protect is not None):
-                self.appendSection('command', '#endif // '+ feature_extra_protect)
-                self.prototypes += [ '#endif' ]
+                command_lines.append('#endif // '+ feature_extra_protect)
+            if command_lines:
+                self.otwrite('both', '\n'.join(command_lines))